@@ -5,8 +5,6 @@
 import argparse
 import sys
 
-import cert_human_py3
-
 
 def cli(argv):
     """Parse arguments.
@@ -45,11 +43,18 @@ def main(cli_args):
         cli_args (:obj:`argparse.Namespace`): Parsed args from sys.argv or list.
 
     """
+    # imported here so that argument parsing and --help do not wait for OpenSSL
+    import cert_human_py3
+
     store_obj = cert_human_py3.CertChainStore.from_socket(
         host=cli_args.host, port=cli_args.port
     )
 
-    print(store_obj.dump_json)
+    out = sys.stdout.buffer
+    for chunk in store_obj.dump_json_iter():
+        out.write(chunk)
+    out.write(b"\n")
+    out.flush()
 
 
 if __name__ == "__main__":